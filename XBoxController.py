@@ -1,5 +1,82 @@
+import collections
+import errno
+import glob
+import os
+import selectors
+import struct
+import sys
+import threading
+import time
+import traceback
+
 import pygame
 
+try:
+  import fcntl
+except ImportError:  # Not available on Windows
+  fcntl = None
+
+
+# evdev (Linux input) codes, see linux/input-event-codes.h
+_EV_SYN = 0x00
+_SYN_REPORT = 0x00
+_SYN_DROPPED = 0x03
+_EV_KEY = 0x01
+_EV_ABS = 0x03
+_ABS_HAT0X = 0x10
+_ABS_HAT0Y = 0x11
+# Key code -> button id
+_EVDEV_BUTTONS = {0x130: 0, 0x131: 1, 0x133: 2, 0x134: 3, 0x136: 4, 0x137: 5, 0x13a: 6, 0x13b: 7, 0x13d: 8, 0x13e: 9}
+# Absolute axis code -> axis id
+_EVDEV_AXIS = {0x00: 0, 0x01: 1, 0x03: 2, 0x04: 3, 0x02: 4, 0x05: 5}
+# struct input_event (timeval, type, code, value)
+_INPUT_EVENT = struct.Struct("llHHi")
+# EVIOCGABS(0) ioctl request, reads a struct input_absinfo (6 x int32)
+_EVIOCGABS = (2 << 30) | (24 << 16) | (ord("E") << 8) | 0x40
+# EVIOCGKEY ioctl request, reads the state of all the keys as a bitmask (KEY_MAX / 8 + 1 bytes)
+_EVIOCGKEY = (2 << 30) | (96 << 16) | (ord("E") << 8) | 0x18
+
+
+# Debug output labels
+_STATE_LABEL = ("pressed", "released")
+_AXIS_LABEL = ("x", "y")
+
+
+def _debugButton(name):
+  """
+  Returns a debug callback for a button that writes its state to stdout.
+  """
+  fmt = (name + " %s\n").__mod__
+  def callback(x):
+    sys.stdout.write(fmt(_STATE_LABEL[x]))
+  return callback
+
+def _debugStick(name):
+  """
+  Returns a debug callback for a stick that writes its axis and value to stdout.
+  """
+  fmt = (name + " [%s]: %.2f\n").__mod__
+  def callback(axis, value):
+    sys.stdout.write(fmt((_AXIS_LABEL[axis], value)))
+  return callback
+
+def _debugTrigger(name):
+  """
+  Returns a debug callback for a trigger that writes its value to stdout.
+  """
+  fmt = (name + ": %.2f\n").__mod__
+  def callback(x):
+    sys.stdout.write(fmt(x))
+  return callback
+
+_FMT_HAT = "Hat: %s\n".__mod__
+
+def _debugHat(x):
+  """
+  Debug callback for the hat that writes its value to stdout.
+  """
+  sys.stdout.write(_FMT_HAT((x,)))
+
 
 class XBoxController():
   """
@@ -10,12 +87,13 @@ class XBoxController():
     - DEBUG (bool): A flag to enable debug mode.
 
   Methods:
-    - __init__(): Initializes the pygame library and the controller object.
+    - __init__(backend, device): Initializes the pygame library and the controller object.
     - connect(): Connects to the first controller, in case it was disconnected since initialization.
     - setCallback(key, callback): Sets the callback for a specific button. Posible keys: ["x", "y", "a", "b", "left_trigger", "right_trigger", "left_bumper", "right_bumper", "back", "start", "left_stick", "right_stick", "left_stick_button", "right_stick_button", "hat"]
     - setCallbacks(callbacks): Sets the callbacks for the event listener.
     - setHz(hz): Sets the frequency of the event listener.
-    - runListener(): Starts a loop that listens for events.
+    - setRealtime(core, priority): Pins the event listener to a CPU core and runs it with real-time priority (Linux only).
+    - runListener(worker): Starts a loop that listens for events, optionally running the callbacks in a worker thread.
     - setDebugCallbacks(): Sets the debug callbacks to print the events to the console.
 
   How to define a callback:
@@ -27,61 +105,122 @@ class XBoxController():
   """
 
     # Button mappings
-  BUTTONS = {0: "a", 1: "b", 2: "x", 3: "y", 4: "left_bumper", 5: "right_bumper", 6: "back", 7: "start", 8: "left_stick_button", 9: "right_stick_button"}
+  BUTTONS = ("a", "b", "x", "y", "left_bumper", "right_bumper", "back", "start", "left_stick_button", "right_stick_button")
   # Axis mappings
-  AXIS = {0: "left_stick_x", 1: "left_stick_y", 2: "right_stick_x", 3: "right_stick_y", 4: "left_trigger", 5: "right_trigger"}
+  AXIS = ("left_stick_x", "left_stick_y", "right_stick_x", "right_stick_y", "left_trigger", "right_trigger")
 
 
   _controller = None  # Controller object
-  _callbacks = {  # Callbacks for each button
-    "x": None,
-    "y": None,
-    "a": None,
-    "b": None,
-    "left_trigger": None,
-    "right_trigger": None,
-    "left_bumper": None,
-    "right_bumper": None,
-    "back": None,
-    "start": None,
-    "left_stick": None,
-    "right_stick": None,    
-    "left_stick_button": None,
-    "right_stick_button": None,    
-    "hat": None
+  __backend = "pygame"  # Backend used to read the controller ("pygame" or "evdev")
+  __device = None  # Path of the evdev device ("evdev" backend)
+  __fd = None  # File descriptor of the evdev device ("evdev" backend)
+  __selector = None  # Selector waiting on the evdev device, set once the device is ready ("evdev" backend)
+  __openLock = None  # Lock for reopening the evdev device ("evdev" backend)
+  __evdevAxis = None  # Axis code -> (axis id, scale, offset) ("evdev" backend)
+  __pressed = None  # Ids of the pressed buttons ("evdev" backend)
+  __hat = None  # Current hat value ("evdev" backend)
+  __dropped = False  # Set while discarding events after a SYN_DROPPED ("evdev" backend)
+  # Callback key -> attribute holding the callback (set per instance in __init__)
+  _KEY_TO_ATTR = {
+    "x": "_cb_x",
+    "y": "_cb_y",
+    "a": "_cb_a",
+    "b": "_cb_b",
+    "left_trigger": "_cb_left_trigger",
+    "right_trigger": "_cb_right_trigger",
+    "left_bumper": "_cb_left_bumper",
+    "right_bumper": "_cb_right_bumper",
+    "back": "_cb_back",
+    "start": "_cb_start",
+    "left_stick": "_cb_left_stick",
+    "right_stick": "_cb_right_stick",
+    "left_stick_button": "_cb_left_stick_button",
+    "right_stick_button": "_cb_right_stick_button",
+    "hat": "_cb_hat"
   }
-  __clock = None  # Clock object for the event listener
   __hz = 20  # Frequency of the event listener
-  sticks_threshold = 0.2  # Threshold for the stick values
+  __timeout = 50  # Maximum time to wait for events in milliseconds (1000 / __hz)
+  __core = None  # CPU core the event listener is pinned to
+  __priority = None  # SCHED_FIFO priority of the event listener
+  __queue = None  # Records queued for the worker thread: (axis id, None) for the axis motions, (None, event) for the other events
+  __pendingAxis = None  # Axis id -> latest motion event queued for the worker thread
+  __queueLock = None  # Lock for __queue and __pendingAxis
+  __queued = None  # Set when events are queued for the worker thread
+  _sticks_threshold = 0.2  # Threshold for the stick values
+  _thresh2 = _sticks_threshold ** 2  # Squared threshold, compared against the squared stick values
 
   DEBUG = False  # Debug flag
 
   # Constructor
-  def __init__(self):
+  def __init__(self, backend="pygame", device=None):
     """
     Initializes the pygame library and the controller object.
+
+    Args:
+    backend (str): "pygame" to read the controller through pygame (SDL), or "evdev" to read its Linux input device directly, which skips the SDL layer.
+    device (str): The path of the evdev device ("evdev" backend only). By default the first Xbox controller in /dev/input/by-id is used.
     """
 
     pygame.init()
 
-    if pygame.joystick.get_count() < 1:
+    # Callbacks for each button
+    for attr in self._KEY_TO_ATTR.values():
+      setattr(self, attr, None)
+
+    # Event type -> handler
+    self._dispatch = {
+      pygame.JOYBUTTONDOWN: self.__onButtonDown,
+      pygame.JOYBUTTONUP: self.__onButtonUp,
+      pygame.JOYAXISMOTION: self.__onAxisMotion,
+      pygame.JOYHATMOTION: self.__onHatMotion,
+      pygame.JOYDEVICEADDED: self.__onDeviceAdded,
+      pygame.JOYDEVICEREMOVED: self.__onDeviceRemoved
+    }
+    self.__buildDispatch()
+
+    if backend == "evdev":
+      self.__backend = backend
+      self.__device = device
+      self.__openLock = threading.Lock()
+      self.__openEvdev()
+    elif backend != "pygame":
+      raise ValueError(f"Unknown backend: {backend}")
+    elif pygame.joystick.get_count() < 1:
       raise(IOError, "No controller detected")
     else:
       self._controller = pygame.joystick.Joystick(0)
       self._controller.init()
 
-      self.__clock = pygame.time.Clock()
-
 
   def connect(self):
     """
     Connects to the first controller, in case it was disconnected since initialization.
+    The current controller is kept if it is still connected. While the listener is running, controllers are also reconnected automatically when they are plugged in again.
+
+    Returns:
+    bool: True if a controller is connected, False otherwise.
     """
 
+    if self.__backend == "evdev":
+      return self.__reopenEvdev()
+
+    # Reuse the current controller while it is still attached (SDL keeps the instance id of unplugged controllers, so look for it in the connected ones)
+    if self._controller is not None:
+      try:
+        instance_id = self._controller.get_instance_id()
+        for i in range(pygame.joystick.get_count()):
+          if pygame.joystick.Joystick(i).get_instance_id() == instance_id:
+            return True
+        self._controller.quit()
+      except pygame.error:
+        pass
+      self._controller = None
+
     if pygame.joystick.get_count() < 1:
         return False
     self._controller = pygame.joystick.Joystick(0)
     self._controller.init()
+    return True
 
   def setCallback(self, key, callback):
     """
@@ -92,7 +231,8 @@ class XBoxController():
     callback (function): The function to be called when the button is pressed.
     """
 
-    self._callbacks[key] = callback
+    setattr(self, self._KEY_TO_ATTR[key], callback)
+    self.__buildDispatch()
 
   def setCallbacks(self, callbacks):
     """
@@ -102,27 +242,349 @@ class XBoxController():
     callbacks (dict): A dictionary with the callbacks for each button.
     """
 
-    self._callbacks = callbacks
+    for key, attr in self._KEY_TO_ATTR.items():
+      setattr(self, attr, callbacks.get(key))
+    self.__buildDispatch()
 
   def setHz(self, hz):
     """
     Sets the frequency of the event listener.
 
     Args:
-    hz (int): The frequency in Hz.
+    hz (int): The frequency in Hz. 0 (or less) means no limit.
     """
     self.__hz = hz
+    self.__timeout = max(1, int(1000 / hz)) if hz > 0 else 1
+
+  @property
+  def sticks_threshold(self):
+    """
+    The threshold for the stick values to trigger the callback.
+    """
+    return self._sticks_threshold
+
+  @sticks_threshold.setter
+  def sticks_threshold(self, value):
+    self._sticks_threshold = value
+    self._thresh2 = value ** 2
+
+  def setRealtime(self, core=1, priority=10):
+    """
+    Pins the event listener to a CPU core and runs it with the SCHED_FIFO real-time policy, which reduces the jitter between an event and its callback.
+    The settings are applied by runListener() to the thread that runs it. They are only supported on Linux, and the real-time policy requires the CAP_SYS_NICE capability (or root); if they can not be applied they are ignored.
+
+    Args:
+    core (int): The CPU core to run the listener on, or None to not pin it.
+    priority (int): The SCHED_FIFO priority [1, 99], or None to keep the default scheduler.
+    """
+    self.__core = core
+    self.__priority = priority
 
-  def runListener(self):
+  def runListener(self, worker=False):
     """
     Starts a loop that listens for events.
+
+    The loop blocks until an event arrives, so events are handled as soon as they are queued. The frequency set with setHz() is only used as the maximum time to wait between wakes.
+    The wait releases the GIL, so other Python threads keep running while the listener is idle.
+    The DEBUG flag is read once when the listener starts.
+    When several motion events of the same axis are queued, only the latest one is handled.
+
+    Args:
+    worker (bool): If True, the callbacks are run in a separate worker thread, so slow callbacks do not delay the listener. Axis motions that pile up while the worker is busy are coalesced to the latest value of each axis.
     """
 
+    # Pick the event handler once, so the DEBUG flag is not checked for every event
+    handle = self.__handleEventDebug if self.DEBUG else self.__handleEvent
+    wait = self.__waitEvdev if self.__backend == "evdev" else self.__waitPygame
+    axis_motion = pygame.JOYAXISMOTION
+
+    # Hand the events over to a worker thread, if requested
+    if worker:
+      self.__queue = collections.deque()
+      self.__pendingAxis = {}
+      self.__queueLock = threading.Lock()
+      self.__queued = threading.Event()
+      threading.Thread(target=self.__runWorker, args=(handle,), daemon=True).start()
+      handle = self.__queueEvent
+
+    # Pin the listener thread and raise its priority, if requested
+    # (after starting the worker, so the worker thread does not inherit the settings)
+    if self.__core is not None:
+      try:
+        os.sched_setaffinity(0, {self.__core})
+      except (AttributeError, OSError):
+        pass
+    if self.__priority is not None:
+      try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.__priority))
+      except (AttributeError, OSError):
+        pass
+
     while (1):
-      self.__clock.tick(self.__hz)
+      # Block until events arrive (or the timeout expires)
+      events = wait(self.__timeout)
+      if not events:
+        continue
+
+      # Coalesce the axis motions, keeping the latest event of each axis
+      latest_axis = {}
+      for event in events:
+        if event.type == axis_motion:
+          latest_axis[event.axis] = event
+
+      for event in events:
+        if event.type != axis_motion or latest_axis[event.axis] is event:
+          handle(event)
+
+  def __waitPygame(self, timeout, _NE=pygame.NOEVENT):
+    """
+    Waits for events in the pygame queue and returns the ones the controller handles.
+
+    Args:
+    timeout (int): The maximum time to wait in milliseconds.
+    """
+
+    first = pygame.event.wait(timeout)
+    if first.type == _NE:
+      return []
+
+    # Pump the OS queue once and drain the rest of the events in a single batch, keeping only the ones with a handler
+    pygame.event.pump()
+    dispatch = self._dispatch
+    return [event for event in (first, *pygame.event.get(pump=False)) if event.type in dispatch]
+
+  def __openEvdev(self):
+    """
+    Opens the evdev device of the controller and reads the range of its axes.
+    """
+
+    device = self.__device
+    if device is None:
+      devices = sorted(glob.glob("/dev/input/by-id/*Xbox*-event-joystick"))
+      if not devices:
+        raise IOError("No controller detected")
+      device = devices[0]
+
+    # Close the previous device, if any
+    self.__closeEvdev()
+
+    self.__fd = os.open(device, os.O_RDONLY | os.O_NONBLOCK)
+    self.__dropped = False
+    self.__pressed = set()
+    self.__hat = [0, 0]
+
+    # Axis code -> (axis id, scale, offset), to map the raw values to [-1.0, 1.0]
+    self.__evdevAxis = {}
+    for code, axis in _EVDEV_AXIS.items():
+      absinfo = self.__readAbs(code)
+      if absinfo and absinfo[2] > absinfo[1]:
+        scale = 2 / (absinfo[2] - absinfo[1])
+        self.__evdevAxis[code] = (axis, scale, -absinfo[1] * scale - 1)
+
+    # Start from the current state of the buttons and the hat
+    self.__syncEvdev()
+
+    # Publish the selector last, the listener treats the device as open once it is set
+    selector = selectors.DefaultSelector()
+    selector.register(self.__fd, selectors.EVENT_READ)
+    self.__selector = selector
+
+  def __reopenEvdev(self):
+    """
+    Opens the evdev device again if it was closed after being unplugged. An open device is left untouched.
+
+    Returns:
+    bool: True if the device is open, False otherwise.
+    """
+
+    with self.__openLock:
+      if self.__selector is None:
+        try:
+          self.__openEvdev()
+        except OSError:
+          return False
+    return True
+
+  def __closeEvdev(self):
+    """
+    Closes the evdev device of the controller, if it is open.
+    """
+
+    if self.__selector is not None:
+      selector, self.__selector = self.__selector, None
+      selector.close()
+    if self.__fd is not None:
+      os.close(self.__fd)
+      self.__fd = None
+
+  def __readAbs(self, code):
+    """
+    Reads the state of an absolute axis of the evdev device.
+
+    Args:
+    code (int): The evdev code of the axis.
+
+    Returns:
+    tuple: The (value, minimum, maximum) of the axis, or None if it can not be read.
+    """
+
+    absinfo = bytearray(24)
+    try:
+      fcntl.ioctl(self.__fd, _EVIOCGABS + code, absinfo)
+    except OSError:
+      return None
+    return struct.unpack_from("iii", absinfo)
+
+  def __syncEvdev(self, _BD=pygame.JOYBUTTONDOWN, _BU=pygame.JOYBUTTONUP, _AM=pygame.JOYAXISMOTION, _HM=pygame.JOYHATMOTION):
+    """
+    Reads the current state of the evdev device, used after the kernel dropped events (SYN_DROPPED).
+
+    Returns:
+    list: The events for the buttons and the hat that changed, and the current value of every axis.
+    """
+
+    Event = pygame.event.Event
+    events = []
+
+    # Buttons
+    keys = bytearray(96)
+    try:
+      fcntl.ioctl(self.__fd, _EVIOCGKEY, keys)
+    except OSError:
+      keys = None
+    if keys is not None:
+      for code, button in _EVDEV_BUTTONS.items():
+        pressed = keys[code >> 3] >> (code & 7) & 1
+        if pressed and button not in self.__pressed:
+          self.__pressed.add(button)
+          events.append(Event(_BD, button=button))
+        elif not pressed and button in self.__pressed:
+          self.__pressed.discard(button)
+          events.append(Event(_BU, button=button))
+
+    # Sticks and triggers
+    for code, (axis, scale, offset) in self.__evdevAxis.items():
+      absinfo = self.__readAbs(code)
+      if absinfo:
+        events.append(Event(_AM, axis=axis, value=absinfo[0] * scale + offset))
+
+    # Hat (evdev reports up as -1, pygame as +1)
+    hat_x = self.__readAbs(_ABS_HAT0X)
+    hat_y = self.__readAbs(_ABS_HAT0Y)
+    hat = [hat_x[0] if hat_x else self.__hat[0], -hat_y[0] if hat_y else self.__hat[1]]
+    if hat != self.__hat:
+      self.__hat = hat
+      events.append(Event(_HM, hat=0, value=tuple(hat)))
+    return events
+
+  def __waitEvdev(self, timeout, _BD=pygame.JOYBUTTONDOWN, _BU=pygame.JOYBUTTONUP, _AM=pygame.JOYAXISMOTION, _HM=pygame.JOYHATMOTION):
+    """
+    Waits for input on the evdev device and decodes it into pygame events.
+    If the device was unplugged, it is closed and no events are returned until it is plugged in again. The listener tries to open it again once per timeout.
+
+    Args:
+    timeout (int): The maximum time to wait in milliseconds.
+    """
+
+    events = []
+    selector = self.__selector
+    # Unplugged, try to open the device again
+    if selector is None:
+      time.sleep(timeout / 1000)
+      self.__reopenEvdev()
+      return events
+    if not selector.select(timeout / 1000):
+      return events
+
+    # Read up to 64 input events with a single syscall
+    try:
+      buf = os.read(self.__fd, _INPUT_EVENT.size * 64)
+    except BlockingIOError:
+      return events
+    except OSError as e:
+      # Unplugged
+      if e.errno != errno.ENODEV:
+        raise
+      self.__closeEvdev()
+      return events
+
+    Event = pygame.event.Event
+    for _, _, type, code, value in _INPUT_EVENT.iter_unpack(buf):
+      # Frame markers, after an overrun drop the events until the next report and read the state again
+      if type == _EV_SYN:
+        if code == _SYN_DROPPED:
+          self.__dropped = True
+        elif code == _SYN_REPORT and self.__dropped:
+          self.__dropped = False
+          events.extend(self.__syncEvdev())
+      elif self.__dropped:
+        continue
+      # Buttons (value: 1 pressed, 0 released, 2 autorepeat)
+      elif type == _EV_KEY:
+        button = _EVDEV_BUTTONS.get(code)
+        if button is not None and value != 2:
+          if value:
+            self.__pressed.add(button)
+          else:
+            self.__pressed.discard(button)
+          events.append(Event(_BD if value else _BU, button=button))
+      elif type == _EV_ABS:
+        # Sticks and triggers
+        axis = self.__evdevAxis.get(code)
+        if axis:
+          events.append(Event(_AM, axis=axis[0], value=value * axis[1] + axis[2]))
+        # Hat (evdev reports up as -1, pygame as +1)
+        elif code == _ABS_HAT0X:
+          self.__hat[0] = value
+          events.append(Event(_HM, hat=0, value=tuple(self.__hat)))
+        elif code == _ABS_HAT0Y:
+          self.__hat[1] = -value
+          events.append(Event(_HM, hat=0, value=tuple(self.__hat)))
+    return events
+
+  def __queueEvent(self, event, _AM=pygame.JOYAXISMOTION):
+    """
+    Queues an event for the worker thread. Only the latest motion event of each axis is kept in the queue, at the position of its last occurrence.
 
-      for event in pygame.event.get():
-        self.__handleEvent(event)
+    Args:
+    event (pygame.event.Event): The event to be queued.
+    """
+
+    with self.__queueLock:
+      if event.type == _AM:
+        # Move the record of the axis to the end of the queue, with the latest event
+        record = (event.axis, None)
+        if event.axis in self.__pendingAxis:
+          self.__queue.remove(record)
+        self.__pendingAxis[event.axis] = event
+        self.__queue.append(record)
+      else:
+        self.__queue.append((None, event))
+    self.__queued.set()
+
+  def __runWorker(self, handle):
+    """
+    Runs the callbacks of the queued events, in the order they were queued.
+
+    Args:
+    handle (function): The event handler.
+    """
+
+    queue = self.__queue
+    while (1):
+      self.__queued.wait()
+      self.__queued.clear()
+      while queue:
+        with self.__queueLock:
+          axis, event = queue.popleft()
+          # Axis motion, take the latest event of the axis
+          if axis is not None:
+            event = self.__pendingAxis.pop(axis)
+        # Report a failing callback and keep running the next ones
+        try:
+          handle(event)
+        except Exception:
+          traceback.print_exc()
 
   def __handleEvent(self, event):
     """
@@ -132,46 +594,151 @@ class XBoxController():
     event (pygame.event.Event): The event to be handled.
     """
 
-    # DEBUG - Print the event details
-    if self.DEBUG: 
-      print(event)
-      print("[DEBUG] >>> ", end="")
-      if event.type == pygame.JOYBUTTONDOWN or event.type == pygame.JOYBUTTONUP:
-        print(self.BUTTONS[event.button])
-      elif event.type == pygame.JOYAXISMOTION:
-        print(self.AXIS[event.axis])
-      elif event.type == pygame.JOYHATMOTION:
-        print("hat", event.value)
-      
     # PARSE EVENT - Trigger the appropriate callback
-    # Pressing a button down
-    if event.type == pygame.JOYBUTTONDOWN:
-      if self._callbacks[self.BUTTONS[event.button]]:
-        (self._callbacks[self.BUTTONS[event.button]])(0)
-    # Releasing a button
-    elif event.type == pygame.JOYBUTTONUP:
-      if self._callbacks[self.BUTTONS[event.button]]:
-        self._callbacks[self.BUTTONS[event.button]](1)
-    # Moving a stick or trigger
-    elif event.type == pygame.JOYAXISMOTION:
-      # Left stick
-      if (event.axis == 0 or event.axis == 1) and abs(event.value) > self.sticks_threshold:
-        if event.axis == 0 and self._callbacks["left_stick"]: self._callbacks["left_stick"](0, event.value)
-        elif event.axis == 1 and self._callbacks["left_stick"]: self._callbacks["left_stick"](1, -event.value)
-      # Right stick
-      elif (event.axis == 2 or event.axis == 3) and abs(event.value) > self.sticks_threshold:
-        if event.axis == 2 and self._callbacks["right_stick"]: self._callbacks["right_stick"](0, event.value)
-        elif event.axis == 3 and self._callbacks["right_stick"]: self._callbacks["right_stick"](1, -event.value)
-      # Left trigger
-      elif event.axis == 4:
-        if self._callbacks["left_trigger"]: self._callbacks["left_trigger"](event.value)
-      # Right trigger
-      elif event.axis == 5:
-        if self._callbacks["right_trigger"]: self._callbacks["right_trigger"](event.value)
-    # Moving the hat
-    elif event.type == pygame.JOYHATMOTION:
-      if self._callbacks["hat"]: self._callbacks["hat"](event.value)
+    handler = self._dispatch.get(event.type)
+    if handler:
+      handler(event)
+
+  def __handleEventDebug(self, event, _BD=pygame.JOYBUTTONDOWN, _BU=pygame.JOYBUTTONUP, _AM=pygame.JOYAXISMOTION, _HM=pygame.JOYHATMOTION, _DA=pygame.JOYDEVICEADDED, _DR=pygame.JOYDEVICEREMOVED):
+    """
+    Prints the event details and then handles it like __handleEvent. Used by the listener when DEBUG is enabled.
+
+    Args:
+    event (pygame.event.Event): The event to be handled.
+    """
+
+    # DEBUG - Print the event details
+    print(event)
+    print("[DEBUG] >>> ", end="")
+    if event.type == _BD or event.type == _BU:
+      print(self.BUTTONS[event.button] if event.button < len(self.BUTTONS) else "unmapped button")
+    elif event.type == _AM:
+      print(self.AXIS[event.axis] if event.axis < len(self.AXIS) else "unmapped axis")
+    elif event.type == _HM:
+      print("hat", event.value)
+    elif event.type == _DA:
+      print("device added", event.device_index)
+    elif event.type == _DR:
+      print("device removed", event.instance_id)
+    else:
+      print()
+
+    self.__handleEvent(event)
+
+  def __buildDispatch(self):
+    """
+    Builds the lookup tables used by the event handlers from the current callbacks.
+    """
+
+    # Button id -> callback
+    self._button_cb = [getattr(self, self._KEY_TO_ATTR[button]) for button in self.BUTTONS]
+    # Axis id -> (callback, sign)
+    self._axis_cb = [
+      (self._cb_left_stick, 1), (self._cb_left_stick, -1),
+      (self._cb_right_stick, 1), (self._cb_right_stick, -1),
+      (self._cb_left_trigger, 1), (self._cb_right_trigger, 1)
+    ]
+
+  def __onButtonDown(self, event):
+    """
+    Triggers the callback of a pressed button. Unmapped buttons are ignored.
+
+    Args:
+    event (pygame.event.Event): The JOYBUTTONDOWN event.
+    """
 
+    button = event.button
+    if button >= len(self._button_cb): return
+    cb = self._button_cb[button]
+    if cb: cb(0)
+
+  def __onButtonUp(self, event):
+    """
+    Triggers the callback of a released button. Unmapped buttons are ignored.
+
+    Args:
+    event (pygame.event.Event): The JOYBUTTONUP event.
+    """
+
+    button = event.button
+    if button >= len(self._button_cb): return
+    cb = self._button_cb[button]
+    if cb: cb(1)
+
+  def __onAxisMotion(self, event):
+    """
+    Triggers the callback of a moved stick or trigger. Stick values inside the threshold and unmapped axes are ignored.
+
+    Args:
+    event (pygame.event.Event): The JOYAXISMOTION event.
+    """
+
+    axis = event.axis
+    if axis >= len(self._axis_cb): return
+    cb, sign = self._axis_cb[axis]
+    if not cb: return
+    # Sticks (axis 0-3)
+    if axis < 4:
+      v = event.value
+      if v * v > self._thresh2: cb(axis & 1, sign * v)
+    # Triggers (axis 4-5)
+    else:
+      cb(event.value)
+
+  def __onHatMotion(self, event):
+    """
+    Triggers the callback of the hat.
+
+    Args:
+    event (pygame.event.Event): The JOYHATMOTION event.
+    """
+
+    cb = self._cb_hat
+    if cb: cb(event.value)
+
+  def __onDeviceAdded(self, event):
+    """
+    Connects to a plugged controller if there is no controller.
+
+    Args:
+    event (pygame.event.Event): The JOYDEVICEADDED event.
+    """
+
+    if self._controller is None:
+      self._controller = pygame.joystick.Joystick(event.device_index)
+      self._controller.init()
+
+  def __onDeviceRemoved(self, event):
+    """
+    Releases the controller if it was unplugged.
+
+    Args:
+    event (pygame.event.Event): The JOYDEVICEREMOVED event.
+    """
+
+    if self._controller is not None and self._controller.get_instance_id() == event.instance_id:
+      self._controller.quit()
+      self._controller = None
+
+
+  # Debug callbacks, built once at import time
+  _DEBUG_CBS = {
+    "x": _debugButton("X"),
+    "y": _debugButton("Y"),
+    "a": _debugButton("A"),
+    "b": _debugButton("B"),
+    "left_trigger": _debugTrigger("Left trigger"),
+    "right_trigger": _debugTrigger("Right trigger"),
+    "left_bumper": _debugButton("Left bumper"),
+    "right_bumper": _debugButton("Right bumper"),
+    "back": _debugButton("Back"),
+    "start": _debugButton("Start"),
+    "left_stick": _debugStick("Left stick"),
+    "right_stick": _debugStick("Right stick"),
+    "left_stick_button": _debugButton("Left stick button"),
+    "right_stick_button": _debugButton("Right stick button"),
+    "hat": _debugHat
+  }
 
   # Debug methods
   def setDebugCallbacks(self):
@@ -179,23 +746,7 @@ class XBoxController():
     Sets the debug callbacks to print the events to the console.
     """
 
-    self.setCallbacks({
-      "x": lambda x: print(f"X {"pressed" if x == 0 else "released"}"),
-      "y": lambda x: print(f"Y {"pressed" if x == 0 else "released"}"),
-      "a": lambda x: print(f"A {"pressed" if x == 0 else "released"}"),
-      "b": lambda x: print(f"B {"pressed" if x == 0 else "released"}"),
-      "left_trigger": lambda x: print(f"Left trigger: {x:.2f}"),
-      "right_trigger": lambda x: print(f"Right trigger: {x:.2f}"),
-      "left_bumper": lambda x: print(f"Left bumper {"pressed" if x == 0 else "released"}"),
-      "right_bumper": lambda x: print(f"Right bumper {"pressed" if x == 0 else "released"}"),
-      "back": lambda x: print(f"Back {"pressed" if x == 0 else "released"}"),
-      "start": lambda x: print(f"Start {"pressed" if x == 0 else "released"}"),
-      "left_stick": lambda axis, value: print(f"Left stick [{"y" if axis else "x"}]: {value:.2f}"),
-      "right_stick": lambda axis, value: print(f"Right stick [{"y" if axis else "x"}]: {value:.2f}"),
-      "left_stick_button": lambda x: print(f"Left stick button {"pressed" if x == 0 else "released"}"),
-      "right_stick_button": lambda x: print(f"Right stick button {"pressed" if x == 0 else "released"}"),
-      "hat": lambda x: print(f"Hat: {x}")
-    })
+    self.setCallbacks(self._DEBUG_CBS)
 
 
 